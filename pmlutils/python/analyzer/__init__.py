@@ -1,12 +1,35 @@
 """Package analyzer pour l'analyse de code Dart/Flutter."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 # S'assurer que l'import de config est fait en premier
 from .config import config
-from .audit_analyzer import AuditAnalyzer
-from .dart_analyzer import DartCodeAnalyzer
-from .schema_doc_analyzer import SchemaDocAnalyzer
-from .doc_analyzer import DocAnalyzer
-from .viewmermaid import render_mermaid
+
+# Les analyseurs (pandas, openpyxl, xlsxwriter...) sont importés au premier
+# accès : un outil qui n'utilise que render_mermaid ne paie pas leur coût.
+_LAZY_IMPORTS = {
+    'AuditAnalyzer': 'audit_analyzer',
+    'DartCodeAnalyzer': 'dart_analyzer',
+    'SchemaDocAnalyzer': 'schema_doc_analyzer',
+    'DocAnalyzer': 'doc_analyzer',
+    'render_mermaid': 'viewmermaid'
+}
+
+if TYPE_CHECKING:
+    from .audit_analyzer import AuditAnalyzer
+    from .dart_analyzer import DartCodeAnalyzer
+    from .schema_doc_analyzer import SchemaDocAnalyzer
+    from .doc_analyzer import DocAnalyzer
+    from .viewmermaid import render_mermaid
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = import_module(f".{_LAZY_IMPORTS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'config',
@@ -15,4 +38,4 @@ __all__ = [
     'SchemaDocAnalyzer',
     'DocAnalyzer',
     'render_mermaid'
-]
\ No newline at end of file
+]
@@ -21,41 +21,59 @@
 # </claude>
 
 import sqlite3
+import numpy as np
 import pandas as pd
 import os
 from typing import Dict, Optional, List, Tuple
 import logging
-from openpyxl.worksheet.worksheet import Worksheet
 from .config import config
+from .db_utils import open_connection, read_frame
+from .excel_utils import open_workbook, write_frames
+from .log_utils import get_logger
+from .result_cache import ResultCache
+
+# Méthodes du cycle de vie Flutter, jamais considérées comme du code mort
+LIFECYCLE_METHODS = ['build', 'initState', 'dispose', 'createState']
+
+# Colonnes exportées pour les éléments non utilisés
+UNUSED_METHOD_COLUMNS = [
+    'file_name', 'class_name', 'method_name', 'return_type', 'param_count',
+    'is_async', 'is_static', 'cyclomatic_complexity', 'cognitive_complexity'
+]
+UNUSED_CLASS_COLUMNS = [
+    'file_name', 'class_name', 'class_type', 'widget_type', 'framework_type',
+    'method_count', 'avg_complexity'
+]
 
 class AuditAnalyzer:
     """Analyseur d'audit du code pour la détection de code mort et l'analyse de complexité."""
 
-    def __init__(self):
-        """Initialise l'analyseur avec la configuration de pml.yaml."""
+    def __init__(self, conn: Optional[sqlite3.Connection] = None):
+        """Initialise l'analyseur avec la configuration de pml.yaml.
+
+        Args:
+            conn: Connexion existante à réutiliser (sinon une connexion est
+                ouverte au premier accès et fermée à la fin de run())
+        """
         self.db_path = config.db_path
         self.output_dir = config.output_reports_dir
-        self._setup_logging()
+        self._conn: Optional[sqlite3.Connection] = conn
+        self._owns_conn = conn is None
+        self._usage_counts_ready = False
+        self._method_usage: Optional[pd.DataFrame] = None
+        self._class_usage: Optional[pd.DataFrame] = None
+        self._cache = ResultCache(config.output_temp_dir, self.db_path)
+        self.logger = get_logger('AuditAnalyzer')
 
-        os.makedirs(self.output_dir, exist_ok=True)
         self.logger.info(f"Output directory: {self.output_dir}")
         self.logger.info(f"Database path: {self.db_path}")
 
-    def _setup_logging(self) -> None:
-        """Configure le système de logging."""
-        self.logger = logging.getLogger('AuditAnalyzer')
-        self.logger.setLevel(logging.INFO)
-
-        console_handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
-
     def _connect_db(self) -> sqlite3.Connection:
         """Établit une connexion à la base de données.
 
+        La connexion (fournie ou ouverte au premier appel) est partagée par
+        toutes les requêtes, ainsi que les tables temporaires de comptage.
+
         Returns:
             sqlite3.Connection: Connexion à la base de données
 
@@ -63,11 +81,110 @@ class AuditAnalyzer:
             sqlite3.Error: Si la connexion échoue
         """
         try:
-            return sqlite3.connect(self.db_path)
+            if self._conn is None:
+                self._conn = open_connection(self.db_path)
+            if not self._usage_counts_ready:
+                self._prepare_usage_counts(self._conn)
+                self._usage_counts_ready = True
+            return self._conn
         except sqlite3.Error as e:
             self.logger.error(f"Database connection error: {str(e)}")
             raise
 
+    def _prepare_usage_counts(self, conn: sqlite3.Connection) -> None:
+        """Matérialise le nombre de références par méthode et par classe.
+
+        Les tables de références ne sont parcourues qu'une seule fois ; les
+        requêtes d'audit font ensuite une jointure sur ces tables temporaires
+        au lieu de sous-requêtes corrélées évaluées ligne par ligne.
+
+        Args:
+            conn: Connexion sur laquelle créer les tables temporaires
+        """
+        conn.executescript("""
+        DROP TABLE IF EXISTS temp.method_ref_counts;
+        CREATE TEMP TABLE method_ref_counts (id INTEGER PRIMARY KEY, c INTEGER NOT NULL);
+        INSERT INTO method_ref_counts
+            SELECT referenced_method_id, COUNT(*)
+            FROM method_usage_references
+            GROUP BY referenced_method_id;
+
+        DROP TABLE IF EXISTS temp.class_ref_counts;
+        CREATE TEMP TABLE class_ref_counts (id INTEGER PRIMARY KEY, c INTEGER NOT NULL);
+        INSERT INTO class_ref_counts
+            SELECT referenced_class_id, COUNT(*)
+            FROM class_usage_references
+            GROUP BY referenced_class_id;
+        """)
+
+    def _load_method_usage(self) -> pd.DataFrame:
+        """Charge toutes les méthodes avec leur nombre de références.
+
+        Le résultat est mémorisé : les méthodes non utilisées et les
+        statistiques d'utilisation en sont dérivées sans nouvelle requête.
+
+        Returns:
+            pd.DataFrame: Une ligne par méthode, avec usage_count
+        """
+        if self._method_usage is None:
+            query = """
+            SELECT 
+                sf.file_path as file_name,
+                c.class_name,
+                m.method_name,
+                m.return_type,
+                m.param_count,
+                CASE WHEN m.is_async = 1 THEN 'Yes' ELSE 'No' END as is_async,
+                CASE WHEN m.is_static = 1 THEN 'Yes' ELSE 'No' END as is_static,
+                m.cyclomatic_complexity,
+                m.cognitive_complexity,
+                m.has_annotation,
+                COALESCE(r.c, 0) as usage_count
+            FROM class_methods m
+            LEFT JOIN classes c ON m.class_id = c.class_id
+            LEFT JOIN source_files sf ON c.file_id = sf.file_id
+            LEFT JOIN method_ref_counts r ON r.id = m.method_id
+            ORDER BY m.cyclomatic_complexity DESC, sf.file_path, c.class_name, m.method_name
+            """
+            # En cas de succès du cache, aucune requête ni table temporaire
+            self._method_usage = self._cache.frame(
+                "method_usage", query, lambda: read_frame(self._connect_db(), query)
+            )
+        return self._method_usage
+
+    def _load_class_usage(self) -> pd.DataFrame:
+        """Charge toutes les classes avec leur nombre de références.
+
+        Le résultat est mémorisé : les classes non utilisées et les
+        statistiques d'utilisation en sont dérivées sans nouvelle requête.
+
+        Returns:
+            pd.DataFrame: Une ligne par classe, avec usage_count
+        """
+        if self._class_usage is None:
+            query = """
+            SELECT 
+                sf.file_path as file_name,
+                c.class_name,
+                c.type as class_type,
+                c.widget_type,
+                c.framework_type,
+                COUNT(m.method_id) as method_count,
+                AVG(m.cyclomatic_complexity) as avg_complexity,
+                c.import_count,
+                COALESCE(r.c, 0) as usage_count
+            FROM classes c
+            LEFT JOIN source_files sf ON c.file_id = sf.file_id
+            LEFT JOIN class_ref_counts r ON r.id = c.class_id
+            LEFT JOIN class_methods m ON m.class_id = c.class_id
+            GROUP BY c.class_id
+            ORDER BY sf.file_path, c.class_name
+            """
+            self._class_usage = self._cache.frame(
+                "class_usage", query, lambda: read_frame(self._connect_db(), query)
+            )
+        return self._class_usage
+
     def analyze_unused_methods(self) -> pd.DataFrame:
         """Analyse les méthodes non utilisées dans le code.
 
@@ -78,36 +195,19 @@ class AuditAnalyzer:
             Exception: Si l'analyse échoue
         """
         self.logger.info("Analyzing unused methods...")
-        query = """
-        SELECT 
-            sf.file_path as file_name,
-            c.class_name,
-            m.method_name,
-            m.return_type,
-            m.param_count,
-            CASE WHEN m.is_async = 1 THEN 'Yes' ELSE 'No' END as is_async,
-            CASE WHEN m.is_static = 1 THEN 'Yes' ELSE 'No' END as is_static,
-            m.cyclomatic_complexity,
-            m.cognitive_complexity
-        FROM class_methods m
-        JOIN classes c ON m.class_id = c.class_id
-        JOIN source_files sf ON c.file_id = sf.file_id
-        WHERE NOT EXISTS (
-            SELECT 1 
-            FROM method_usage_references mur 
-            WHERE mur.referenced_method_id = m.method_id
-        )
-        AND m.method_name NOT IN ('build', 'initState', 'dispose', 'createState')
-        AND m.has_annotation = 0
-        ORDER BY m.cyclomatic_complexity DESC, sf.file_path, c.class_name, m.method_name
-        """
         try:
-            with self._connect_db() as conn:
-                df = pd.read_sql_query(query, conn)
+            methods = self._load_method_usage()
+            unused = (
+                (methods['usage_count'] == 0)
+                & ~methods['method_name'].isin(LIFECYCLE_METHODS)
+                & (methods['has_annotation'] == 0)
+                & methods['file_name'].notna()
+            )
+            df = methods.loc[unused, UNUSED_METHOD_COLUMNS].reset_index(drop=True)
 
-            # Statistiques sur la complexité
-            complex_methods = len(df[df['cyclomatic_complexity'] > 10])
-            cognitive_complex = len(df[df['cognitive_complexity'] > 15])
+            # Statistiques sur la complexité (réductions NumPy, sans copie filtrée)
+            complex_methods = int((df['cyclomatic_complexity'].to_numpy() > 10).sum())
+            cognitive_complex = int((df['cognitive_complexity'].to_numpy() > 15).sum())
 
             self.logger.info(f"Found {len(df)} unused methods")
             self.logger.info(f"Complex methods: {complex_methods}, Cognitive complex: {cognitive_complex}")
@@ -127,40 +227,16 @@ class AuditAnalyzer:
             Exception: Si l'analyse échoue
         """
         self.logger.info("Analyzing unused classes...")
-        query = """
-        SELECT 
-            sf.file_path as file_name,
-            c.class_name,
-            c.type as class_type,
-            c.widget_type,
-            c.framework_type,
-            (
-                SELECT COUNT(*)
-                FROM class_methods m
-                WHERE m.class_id = c.class_id
-            ) as method_count,
-            (
-                SELECT AVG(cyclomatic_complexity)
-                FROM class_methods m
-                WHERE m.class_id = c.class_id
-            ) as avg_complexity
-        FROM classes c
-        JOIN source_files sf ON c.file_id = sf.file_id
-        WHERE NOT EXISTS (
-            SELECT 1 
-            FROM class_usage_references cur 
-            WHERE cur.referenced_class_id = c.class_id
-        )
-        ORDER BY sf.file_path, c.class_name
-        """
         try:
-            with self._connect_db() as conn:
-                df = pd.read_sql_query(query, conn)
+            classes = self._load_class_usage()
+            unused = (classes['usage_count'] == 0) & classes['file_name'].notna()
+            df = classes.loc[unused, UNUSED_CLASS_COLUMNS].reset_index(drop=True)
 
             # Statistiques par type
-            type_stats = df['class_type'].value_counts()
+            types, counts = np.unique(df['class_type'].dropna().to_numpy(), return_counts=True)
+            type_stats = dict(zip(types.tolist(), counts.tolist()))
             self.logger.info(f"Found {len(df)} unused classes")
-            self.logger.info(f"Type distribution: {dict(type_stats)}")
+            self.logger.info(f"Type distribution: {type_stats}")
             return df
         except Exception as e:
             self.logger.error(f"Error analyzing unused classes: {str(e)}")
@@ -176,30 +252,22 @@ class AuditAnalyzer:
             Exception: Si la génération échoue
         """
         self.logger.info("Generating usage statistics...")
-        query = """
-        SELECT
-            'Classes' as category,
-            COUNT(*) as total,
-            SUM(CASE WHEN EXISTS (
-                SELECT 1 FROM class_usage_references cur 
-                WHERE cur.referenced_class_id = c.class_id
-            ) THEN 1 ELSE 0 END) as used,
-            ROUND(AVG(import_count), 1) as avg_imports
-        FROM classes c
-        UNION ALL
-        SELECT
-            'Methods' as category,
-            COUNT(*) as total,
-            SUM(CASE WHEN EXISTS (
-                SELECT 1 FROM method_usage_references mur
-                WHERE mur.referenced_method_id = m.method_id
-            ) THEN 1 ELSE 0 END) as used,
-            ROUND(AVG(param_count), 1) as avg_params
-        FROM class_methods m
-        """
         try:
-            with self._connect_db() as conn:
-                df = pd.read_sql_query(query, conn)
+            classes = self._load_class_usage()
+            methods = self._load_method_usage()
+            df = pd.DataFrame({
+                'category': ['Classes', 'Methods'],
+                'total': [len(classes), len(methods)],
+                'used': [
+                    int((classes['usage_count'] > 0).sum()),
+                    int((methods['usage_count'] > 0).sum())
+                ],
+                # Colonne commune : imports moyens (classes), paramètres moyens (méthodes)
+                'avg_imports': [
+                    round(classes['import_count'].mean(), 1),
+                    round(methods['param_count'].mean(), 1)
+                ]
+            })
             df['usage_rate'] = (df['used'] / df['total'] * 100).round(1)
             self.logger.info(f"Usage statistics generated\n{df.to_string()}")
             return df
@@ -224,31 +292,16 @@ class AuditAnalyzer:
             filepath = os.path.join(self.output_dir, config.audit_report_file)
             self.logger.info(f"Writing report to: {filepath}")
 
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            with open_workbook(filepath) as workbook:
                 for sheet_name, df in dfs.items():
                     self.logger.debug(f"Writing sheet: {sheet_name}")
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    self._format_excel_sheet(writer.sheets[sheet_name], df)
+                    write_frames(workbook, sheet_name, [df])
 
             self.logger.info("Audit report exported successfully")
         except Exception as e:
             self.logger.error(f"Error exporting audit report: {str(e)}")
             raise
 
-    def _format_excel_sheet(self, worksheet: Worksheet, df: pd.DataFrame) -> None:
-        """Formate une feuille Excel pour une meilleure lisibilité.
-
-        Args:
-            worksheet: Feuille Excel à formater
-            df: DataFrame source des données
-        """
-        for idx, col in enumerate(df):
-            max_length = max(
-                df[col].astype(str).apply(len).max(),
-                len(str(col))
-            )
-            worksheet.column_dimensions[chr(65 + idx)].width = min(max_length + 2, 50)
-
     def run(self) -> None:
         """Point d'entrée principal de l'analyseur."""
         self.logger.info("Starting audit analysis...")
@@ -258,6 +311,15 @@ class AuditAnalyzer:
         except Exception as e:
             self.logger.error("Audit analysis failed")
             raise
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Ferme la connexion si elle a été ouverte par l'analyseur."""
+        if self._owns_conn and self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self._usage_counts_ready = False
 
 def main() -> None:
     """Point d'entrée pour l'exécution en tant que module."""
@@ -17,31 +17,50 @@
 # - App name configuration
 # - File path generation
 # - Consistent naming patterns
+# - Parsed configuration cached on disk (keyed by pml.yaml mtime)
 # </claude>
 
 import os
+import glob
+import hashlib
+import pickle
 import yaml
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
 from typing import List, Optional
 
-class AnalyzerConfig:
-    def __init__(self):
-        # Initialisation des attributs par défaut
-        self.app_name: str = "minssalor"
-        self.lib_dir: str = "lib"
-        self.excluded_dirs: List[str] = ["lib/generated"]
-        self.excluded_files: List[str] = [".freezed.dart", ".g.dart", "_test.dart"]
-        self.db_dir: str = "pmlutils/database"
-        self.db_name: str = "analysis.db"
-        self.cleanup_on_start: bool = True
-        self.output_doc_dir: str = "pmlutils/output/doc"
-        self.output_reports_dir: str = "pmlutils/output/reports"
-        self.output_temp_dir: str = "pmlutils/output/temp"
-        self.log_level: str = "info"
-        self.log_file: str = "pmlutils/logs/analysis.log"
-        self.log_to_console: bool = True
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Cache de la configuration analysée, invalidé à chaque modification de pml.yaml
+CONFIG_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pml")
 
+# Pas de slots=True : cached_property et le cache sur disque (__dict__.update)
+# ont besoin du __dict__ de l'instance.
+@dataclass
+class AnalyzerConfig:
+    # Valeurs par défaut, remplacées par celles de pml.yaml
+    app_name: str = "minssalor"
+    lib_dir: str = "lib"
+    excluded_dirs: List[str] = field(default_factory=lambda: ["lib/generated"])
+    excluded_files: List[str] = field(default_factory=lambda: [".freezed.dart", ".g.dart", "_test.dart"])
+    db_dir: str = "pmlutils/database"
+    db_name: str = "analysis.db"
+    cleanup_on_start: bool = True
+    output_doc_dir: str = "pmlutils/output/doc"
+    output_reports_dir: str = "pmlutils/output/reports"
+    output_temp_dir: str = "pmlutils/output/temp"
+    log_level: str = "info"
+    log_file: str = "pmlutils/logs/analysis.log"
+    log_to_console: bool = True
+
+    def __post_init__(self) -> None:
         # Chargement de la configuration
         self._load_pml_config()
+        # Création unique des répertoires, au chargement de la configuration
+        self.ensure_directories()
 
     def _load_pml_config(self) -> None:
         """Charge la configuration depuis pml.yaml."""
@@ -49,8 +68,12 @@ class AnalyzerConfig:
             # Remonte de deux niveaux pour trouver pml.yaml à la racine
             pml_path = os.path.join(os.path.dirname(__file__), "../../..", "pml.yaml")
 
+            cache_path = self._cache_path(pml_path)
+            if self._load_cached_config(cache_path):
+                return
+
             with open(pml_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=SafeLoader)
 
             # Configuration de base de l'application
             self.app_name = config['app']['name']
@@ -79,36 +102,85 @@ class AnalyzerConfig:
             self.log_file = log_config['file']
             self.log_to_console = log_config.get('console', True)  # True par défaut
 
+            self._save_cached_config(cache_path)
+
         except Exception as e:
             print(f"Erreur lors du chargement de pml.yaml: {e}")
             print("Utilisation de la configuration par défaut")
 
-    @property
+    def _cache_path(self, pml_path: str) -> str:
+        """Retourne le fichier de cache associé à l'état actuel de pml.yaml.
+
+        Args:
+            pml_path: Chemin vers pml.yaml
+
+        Returns:
+            Chemin du fichier de cache (propre au projet et à la date de modification)
+        """
+        pml_path = os.path.realpath(pml_path)
+        project_key = hashlib.md5(pml_path.encode('utf-8')).hexdigest()[:12]
+        mtime = os.stat(pml_path).st_mtime_ns
+        return os.path.join(CONFIG_CACHE_DIR, f"config-{project_key}-{mtime}.pkl")
+
+    def _load_cached_config(self, cache_path: str) -> bool:
+        """Charge la configuration depuis le cache si elle est à jour.
+
+        Args:
+            cache_path: Fichier de cache à lire
+
+        Returns:
+            True si la configuration a été chargée depuis le cache
+        """
+        try:
+            with open(cache_path, 'rb') as f:
+                self.__dict__.update(pickle.load(f))
+            return True
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            return False
+
+    def _save_cached_config(self, cache_path: str) -> None:
+        """Enregistre la configuration analysée et supprime les caches périmés.
+
+        Args:
+            cache_path: Fichier de cache à écrire
+        """
+        try:
+            os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+            stale_pattern = cache_path.rsplit('-', 1)[0] + '-*.pkl'
+            for stale in glob.glob(stale_pattern):
+                os.remove(stale)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(asdict(self), f)
+        except OSError:
+            # Le cache est une optimisation : son absence n'est pas bloquante
+            pass
+
+    @cached_property
     def db_path(self) -> str:
         """Retourne le chemin complet vers la base de données."""
         return os.path.join(self.db_dir, self.db_name)
 
-    @property
+    @cached_property
     def log_path(self) -> str:
         """Retourne le chemin complet vers le fichier de log."""
         return os.path.join(os.path.dirname(os.path.dirname(self.log_file)))
 
-    @property
+    @cached_property
     def documentation_file(self) -> str:
         """Nom du fichier de documentation Excel."""
         return f"{self.app_name}_documentation.xlsx"
 
-    @property
+    @cached_property
     def markdown_documentation_file(self) -> str:
         """Nom du fichier de documentation Markdown."""
         return f"{self.app_name}_documentation.md"
 
-    @property
+    @cached_property
     def dart_analysis_file(self) -> str:
         """Nom du fichier d'analyse Dart."""
         return f"{self.app_name}_dart_analysis.xlsx"
 
-    @property
+    @cached_property
     def audit_report_file(self) -> str:
         """Nom du fichier de rapport d'audit."""
         return f"{self.app_name}_audit.xlsx"
@@ -32,10 +32,33 @@ import sqlite3
 import pandas as pd
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 from .schema_doc_analyzer import SchemaDocAnalyzer
 from .audit_analyzer import AuditAnalyzer
 from .config import config
+from .db_utils import CHUNK_SIZE, iter_frames, open_connection, read_frame
+from .excel_utils import open_workbook, write_frames
+from .log_utils import get_logger
+from .result_cache import ResultCache
+
+# Index utilisés par les jointures d'analyse et d'audit. Les noms reprennent
+# ceux de db_schema.dart afin que la création soit sans effet sur une base
+# récente et ne complète que les bases générées par une version antérieure.
+ANALYSIS_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_method_usage_referenced ON method_usage_references(referenced_method_id)',
+    'CREATE INDEX IF NOT EXISTS idx_class_usage_referenced ON class_usage_references(referenced_class_id)',
+    'CREATE INDEX IF NOT EXISTS idx_methods_class ON class_methods(class_id)',
+    'CREATE INDEX IF NOT EXISTS idx_class_file ON classes(file_id)',
+    # Index partiel des méthodes candidates, déjà triées par complexité.
+    # SQLite ne l'utilise que si la requête reprend ces conditions à l'identique
+    # (analyze_methods).
+    "CREATE INDEX IF NOT EXISTS idx_methods_eligible "
+    "ON class_methods(cyclomatic_complexity DESC, class_id) "
+    "WHERE has_annotation = 0 "
+    "AND method_name NOT IN ('build', 'initState', 'dispose', 'createState')"
+]
 
 class DartCodeAnalyzer:
     """Analyseur principal de code Dart avec génération de rapports."""
@@ -44,27 +67,16 @@ class DartCodeAnalyzer:
         """Initialise l'analyseur avec la configuration de pml.yaml."""
         self.db_path = config.db_path
         self.output_dir = config.output_reports_dir
-        self._setup_logging()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cache = ResultCache(config.output_temp_dir, self.db_path)
+        self.logger = get_logger('DartCodeAnalyzer')
 
-        # Création du répertoire de sortie
-        os.makedirs(self.output_dir, exist_ok=True)
         self.logger.info(f"Output directory: {self.output_dir}")
         self.logger.info(f"Database path: {self.db_path}")
 
         # Test de la connexion à la base de données
         self._test_db_connection()
-
-    def _setup_logging(self) -> None:
-        """Configure le système de logging."""
-        self.logger = logging.getLogger('DartCodeAnalyzer')
-        self.logger.setLevel(logging.INFO)
-
-        console_handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        self._ensure_indexes()
 
     def _test_db_connection(self) -> None:
         """Teste la connexion à la base de données.
@@ -80,8 +92,34 @@ class DartCodeAnalyzer:
             self.logger.error(f"Database connection error: {str(e)}")
             raise Exception(f"Database connection error: {str(e)}")
 
+    def _ensure_indexes(self) -> None:
+        """Crée les index nécessaires aux requêtes d'analyse s'ils manquent.
+
+        Les statistiques du planificateur sont calculées une fois par base
+        (la base est recréée à chaque analyse Dart).
+
+        Raises:
+            Exception: Si la création des index échoue
+        """
+        try:
+            with self.connect() as conn:
+                for index_def in ANALYSIS_INDEXES:
+                    conn.execute(index_def)
+                has_stats = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+                ).fetchone()
+                if not has_stats:
+                    conn.execute("ANALYZE")
+            self.logger.debug("Analysis indexes ready")
+        except sqlite3.Error as e:
+            self.logger.error(f"Error creating indexes: {str(e)}")
+            raise Exception(f"Error creating indexes: {str(e)}")
+
     def connect(self) -> sqlite3.Connection:
-        """Établit une connexion à la base de données.
+        """Retourne la connexion partagée à la base de données.
+
+        La connexion est ouverte au premier appel puis réutilisée par toutes
+        les analyses, ce qui conserve le cache de pages SQLite entre requêtes.
 
         Returns:
             sqlite3.Connection: Connexion à la base de données
@@ -89,11 +127,51 @@ class DartCodeAnalyzer:
         Raises:
             sqlite3.Error: Si la connexion échoue
         """
-        return sqlite3.connect(self.db_path)
+        if self._conn is None:
+            self._conn = open_connection(self.db_path)
+        return self._conn
+
+    def close(self) -> None:
+        """Ferme la connexion partagée."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _iter_query(self, query: str, chunksize: int, label: str) -> Iterator[pd.DataFrame]:
+        """Lit le résultat d'une requête bloc par bloc, via le cache Parquet.
+
+        Args:
+            query: Requête SQL à exécuter
+            chunksize: Nombre de lignes par bloc
+            label: Libellé utilisé dans les logs et pour le cache
+
+        Yields:
+            pd.DataFrame: Bloc de résultats
+
+        Raises:
+            Exception: Si la lecture échoue
+        """
+        row_count = 0
+        try:
+            chunks = self._cache.frames(
+                label, query, lambda: iter_frames(self.connect(), query, chunksize), chunksize
+            )
+            for chunk in chunks:
+                row_count += len(chunk)
+                yield chunk
+        except Exception as e:
+            self.logger.error(f"Error reading {label}: {str(e)}")
+            raise
+        self.logger.info(f"Streamed {row_count} {label}")
 
-    def analyze_methods(self) -> pd.DataFrame:
+    def analyze_methods(
+        self, chunksize: Optional[int] = None
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Analyse la complexité et les caractéristiques des méthodes.
 
+        Args:
+            chunksize: Si fourni, retourne un itérateur de blocs de cette taille
+
         Returns:
             pd.DataFrame: DataFrame contenant l'analyse des méthodes
 
@@ -110,8 +188,8 @@ class DartCodeAnalyzer:
             m.param_count,
             m.cyclomatic_complexity,
             m.cognitive_complexity,
-            m.is_async,
-            m.is_static
+            CASE WHEN m.is_async = 1 THEN 'Yes' ELSE 'No' END as is_async,
+            CASE WHEN m.is_static = 1 THEN 'Yes' ELSE 'No' END as is_static
         FROM 
             class_methods m
             INNER JOIN classes c ON m.class_id = c.class_id
@@ -126,19 +204,27 @@ class DartCodeAnalyzer:
             c.class_name,
             m.method_name
         """
+        if chunksize:
+            return self._iter_query(query, chunksize, "methods")
         try:
-            with self.connect() as conn:
-                df = pd.read_sql_query(query, conn)
+            df = self._cache.frame("methods", query, lambda: read_frame(self.connect(), query))
             self.logger.info(f"Analyzed {len(df)} methods")
-            self.logger.debug(f"Found {len(df[df['cyclomatic_complexity'] > 10])} complex methods")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                complex_methods = int((df['cyclomatic_complexity'].to_numpy() > 10).sum())
+                self.logger.debug(f"Found {complex_methods} complex methods")
             return df
         except Exception as e:
             self.logger.error(f"Error analyzing methods: {str(e)}")
             raise
 
-    def analyze_class_hierarchy(self) -> pd.DataFrame:
+    def analyze_class_hierarchy(
+        self, chunksize: Optional[int] = None
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Analyse la hiérarchie des classes et leurs méthodes.
 
+        Args:
+            chunksize: Si fourni, retourne un itérateur de blocs de cette taille
+
         Returns:
             pd.DataFrame: DataFrame contenant la hiérarchie des classes
 
@@ -169,14 +255,15 @@ class DartCodeAnalyzer:
             c.class_name,
             m.method_name
         """
+        if chunksize:
+            return self._iter_query(query, chunksize, "hierarchy rows")
         try:
-            with self.connect() as conn:
-                df = pd.read_sql_query(query, conn)
+            df = self._cache.frame("hierarchy rows", query, lambda: read_frame(self.connect(), query))
 
             stats = {
                 'total_classes': len(df['class_name'].unique()),
-                'widget_classes': len(df[df['widget_type'].notna()]),
-                'framework_classes': len(df[df['framework_type'].notna()])
+                'widget_classes': int(df['widget_type'].notna().sum()),
+                'framework_classes': int(df['framework_type'].notna().sum())
             }
             self.logger.info(
                 f"Class statistics - Total: {stats['total_classes']}, "
@@ -192,6 +279,9 @@ class DartCodeAnalyzer:
     def get_file_contents(self) -> pd.DataFrame:
         """Récupère un résumé du contenu de chaque fichier.
 
+        Les méthodes sont regroupées par classe puis les classes par fichier
+        côté pandas : SQLite refuse les GROUP_CONCAT imbriqués.
+
         Returns:
             pd.DataFrame: DataFrame contenant le résumé des fichiers
 
@@ -202,30 +292,52 @@ class DartCodeAnalyzer:
         query = """
         SELECT
             sf.file_path as file_name,
-            GROUP_CONCAT(DISTINCT 
-                c.class_name || ' (' || c.type || ') -> ' || 
-                GROUP_CONCAT(m.method_name)
-            ) as content
+            c.class_id,
+            c.class_name,
+            c.type,
+            m.method_name
         FROM source_files sf
         LEFT JOIN classes c ON sf.file_id = c.file_id
         LEFT JOIN class_methods m ON c.class_id = m.class_id
-        GROUP BY sf.file_path
-        ORDER BY sf.file_path
+        ORDER BY sf.file_path, c.class_name, m.method_name
         """
         try:
             with self.connect() as conn:
-                df = pd.read_sql_query(query, conn)
+                df_cm = read_frame(conn, query)
+
+            # Méthodes par classe : "Classe (type) -> m1,m2"
+            classes = (
+                df_cm.dropna(subset=['class_id'])
+                .groupby(['file_name', 'class_id', 'class_name', 'type'], sort=False, dropna=False)
+                ['method_name']
+                .agg(lambda names: ','.join(names.dropna()))
+                .reset_index()
+            )
+            classes['content'] = (
+                classes['class_name'] + ' (' + classes['type'].fillna('') + ') -> '
+                + classes['method_name']
+            )
+
+            # Classes par fichier, fichiers sans classe conservés
+            contents = classes.groupby('file_name', sort=False)['content'].agg('; '.join)
+            df = (
+                df_cm[['file_name']].drop_duplicates()
+                .merge(contents.reset_index(), on='file_name', how='left')
+            )
             self.logger.info(f"Got contents for {len(df)} files")
             return df
         except Exception as e:
             self.logger.error(f"Error getting file contents: {str(e)}")
             raise
 
-    def export_to_excel(self, dataframes: Dict[str, pd.DataFrame]) -> None:
+    def export_to_excel(
+        self, dataframes: Dict[str, Union[pd.DataFrame, Iterable[pd.DataFrame]]]
+    ) -> None:
         """Exporte les données dans un fichier Excel.
 
         Args:
-            dataframes: Dictionnaire de DataFrames à exporter
+            dataframes: Dictionnaire de DataFrames à exporter, ou d'itérateurs
+                de blocs écrits les uns à la suite des autres dans la feuille
 
         Raises:
             Exception: Si l'export échoue
@@ -235,66 +347,79 @@ class DartCodeAnalyzer:
         self.logger.info(f"Writing to: {filepath}")
 
         try:
-            # Prétraitement des données
-            processed_dfs = {}
-            for name, df in dataframes.items():
-                df = df.fillna('')
-                for col in df.select_dtypes(include=['bool']).columns:
-                    df[col] = df[col].map({True: 'Yes', False: 'No'})
-                processed_dfs[name] = df
-
-            # Export vers Excel
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                for sheet_name, df in processed_dfs.items():
+            with open_workbook(filepath) as workbook:
+                for sheet_name, data in dataframes.items():
                     self.logger.debug(f"Writing sheet: {sheet_name}")
                     safe_sheet_name = sheet_name[:31]  # Limite Excel
-                    df.to_excel(writer, sheet_name=safe_sheet_name, index=False)
+                    chunks = [data] if isinstance(data, pd.DataFrame) else data
 
-                    # Formatage des colonnes
-                    self._format_excel_sheet(writer.sheets[safe_sheet_name], df)
+                    write_frames(
+                        workbook,
+                        safe_sheet_name,
+                        (self._preprocess_frame(df) for df in chunks)
+                    )
 
             self.logger.info("Excel export completed successfully")
         except Exception as e:
             self.logger.error(f"Error exporting to Excel: {str(e)}")
             raise
 
-    def _format_excel_sheet(self, worksheet: Any, df: pd.DataFrame) -> None:
-        """Formate une feuille Excel pour une meilleure lisibilité.
+    def _preprocess_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Prépare un DataFrame (ou un bloc) avant son écriture dans Excel.
+
+        Les indicateurs booléens sont déjà traduits en Yes/No par les
+        requêtes SQL. Seules les colonnes texte sont remplacées : les
+        colonnes numériques ne sont pas copiées.
 
         Args:
-            worksheet: Feuille Excel à formater
-            df: DataFrame source des données
+            df: DataFrame à préparer
+
+        Returns:
+            pd.DataFrame: DataFrame sans texte manquant
         """
-        for idx, col in enumerate(df):
-            max_length = max(
-                df[col].astype(str).apply(len).max(),
-                len(str(col))
-            )
-            worksheet.column_dimensions[chr(65 + idx)].width = min(max_length + 2, 50)
+        df = df.copy(deep=False)
+        for col in df.select_dtypes(include='object').columns:
+            df[col] = df[col].fillna('')
+        return df
 
-    def run_all_analyses(self) -> None:
-        """Exécute toutes les analyses disponibles."""
-        self.logger.info("Starting comprehensive analysis")
-        try:
-            # Analyses principales
-            exports = {
-                "Methods": self.analyze_methods(),
-                "Hierarchy": self.analyze_class_hierarchy()
-            }
+    def _run_reader_analysis(self, analyzer_cls: type) -> None:
+        """Exécute un analyseur sur sa propre connexion en lecture seule.
 
-            # Export Excel
-            self.logger.info("Exporting main analysis results...")
-            self.export_to_excel(exports)
+        Args:
+            analyzer_cls: Classe d'analyseur acceptant un argument conn
+        """
+        with closing(open_connection(self.db_path, read_only=True)) as conn:
+            analyzer_cls(conn=conn).run()
 
-            # Documentation
-            self.logger.info("Starting documentation analysis...")
-            doc_analyzer = SchemaDocAnalyzer()
-            doc_analyzer.run()
+    def run_all_analyses(self) -> None:
+        """Exécute toutes les analyses disponibles.
 
-            # Audit
-            self.logger.info("Starting audit analysis...")
-            audit_analyzer = AuditAnalyzer()
-            audit_analyzer.run()
+        La documentation et l'audit sont indépendants et en lecture seule :
+        ils s'exécutent dans des threads, chacun sur sa propre connexion,
+        pendant que les analyses principales sont exportées.
+        """
+        self.logger.info("Starting comprehensive analysis")
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = {
+                    executor.submit(self._run_reader_analysis, SchemaDocAnalyzer): "Documentation",
+                    executor.submit(self._run_reader_analysis, AuditAnalyzer): "Audit"
+                }
+                self.logger.info("Started documentation and audit analyses")
+
+                # Les résultats sont lus par blocs et écrits au fil de l'eau
+                exports = {
+                    "Methods": self.analyze_methods(chunksize=CHUNK_SIZE),
+                    "Hierarchy": self.analyze_class_hierarchy(chunksize=CHUNK_SIZE)
+                }
+
+                # Export Excel
+                self.logger.info("Exporting main analysis results...")
+                self.export_to_excel(exports)
+
+                for future in as_completed(futures):
+                    future.result()
+                    self.logger.info(f"{futures[future]} analysis finished")
 
             self.logger.info("All analyses completed successfully")
         except Exception as e:
@@ -305,7 +430,10 @@ def main() -> None:
     """Point d'entrée pour l'exécution en tant que module."""
     try:
         analyzer = DartCodeAnalyzer()
-        analyzer.run_all_analyses()
+        try:
+            analyzer.run_all_analyses()
+        finally:
+            analyzer.close()
     except Exception as e:
         logging.error("Dart code analysis failed", exc_info=True)
         raise
@@ -0,0 +1,148 @@
+# <claude>
+# File: db_utils.py
+# Date: 2025-02-06
+#
+# USER INFO
+# - Shared SQLite connection factory for Python analyzers
+# - Applies read-oriented PRAGMAs on every connection
+# - Used by audit, Dart and schema analyzers
+#
+# CONTEXT
+# - Analyzers are post-process readers of the database
+#   produced by the Dart analysis
+# - WAL is safe here: the Dart writer has finished when
+#   the Python analyzers run
+#
+# KEY FEATURES
+# - WAL journal with NORMAL synchronous mode
+# - Memory-mapped reads and large page cache
+# - In-memory temporary storage
+# - Read-only connections for parallel analyses
+# - Columnar result loading through pyarrow when available
+# </claude>
+
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List, Sequence
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# PRAGMAs appliqués à chaque connexion : les grosses requêtes de lecture
+# sont servies par des pages mappées en mémoire plutôt que par des pread.
+READ_PRAGMAS = """
+PRAGMA mmap_size = 268435456;
+PRAGMA cache_size = -200000;
+PRAGMA temp_store = MEMORY;
+"""
+
+# PRAGMAs réservés aux connexions en écriture (le mode WAL est persistant :
+# les connexions en lecture seule ouvertes ensuite en profitent)
+WRITE_PRAGMAS = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+"""
+
+# Taille des blocs pour la lecture en flux des grosses requêtes
+CHUNK_SIZE = 50_000
+
+def open_connection(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """Ouvre une connexion SQLite configurée pour l'analyse.
+
+    Args:
+        db_path: Chemin vers la base de données
+        read_only: Ouvre la base en lecture seule (URI mode=ro), pour les
+            analyses exécutées en parallèle dans des threads distincts
+
+    Returns:
+        sqlite3.Connection: Connexion configurée
+
+    Raises:
+        sqlite3.Error: Si la connexion ou la configuration échoue
+    """
+    # Mode autocommit : aucune transaction implicite autour des écritures
+    # (index, tables temporaires), les lectures n'en ont pas besoin.
+    # check_same_thread=False : la connexion peut être confiée à un worker.
+    if read_only:
+        uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, isolation_level=None,
+                               check_same_thread=False)
+    else:
+        conn = sqlite3.connect(db_path, isolation_level=None,
+                               check_same_thread=False)
+    try:
+        conn.executescript(READ_PRAGMAS if read_only else WRITE_PRAGMAS + READ_PRAGMAS)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+def _rows_to_frame(rows: List[Sequence], names: List[str]) -> pd.DataFrame:
+    """Convertit un lot de lignes en DataFrame.
+
+    Avec pyarrow, chaque colonne est convertie en tableau Arrow typé puis
+    en DataFrame en une seule passe ; sinon pandas construit le DataFrame
+    ligne par ligne.
+
+    Args:
+        rows: Lignes retournées par le curseur
+        names: Noms des colonnes
+
+    Returns:
+        pd.DataFrame: Lot de résultats
+    """
+    if not rows:
+        return pd.DataFrame(columns=names)
+    if pa is not None:
+        try:
+            columns = [pa.array(values) for values in zip(*rows)]
+            return pa.table(columns, names=names).to_pandas()
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Colonne aux types mélangés (typage dynamique SQLite)
+            pass
+    return pd.DataFrame.from_records(rows, columns=names)
+
+def iter_frames(
+    conn: sqlite3.Connection, query: str, chunksize: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Exécute une requête et retourne son résultat par blocs.
+
+    Au moins un bloc est produit (vide, avec les colonnes, si la requête
+    ne retourne aucune ligne).
+
+    Args:
+        conn: Connexion à la base
+        query: Requête SQL à exécuter
+        chunksize: Nombre de lignes par bloc
+
+    Yields:
+        pd.DataFrame: Bloc de résultats
+    """
+    cursor = conn.execute(query)
+    names = [description[0] for description in cursor.description]
+    rows = cursor.fetchmany(chunksize)
+    yield _rows_to_frame(rows, names)
+    while rows:
+        rows = cursor.fetchmany(chunksize)
+        if rows:
+            yield _rows_to_frame(rows, names)
+
+def read_frame(conn: sqlite3.Connection, query: str) -> pd.DataFrame:
+    """Exécute une requête et retourne son résultat complet.
+
+    Args:
+        conn: Connexion à la base
+        query: Requête SQL à exécuter
+
+    Returns:
+        pd.DataFrame: Résultat de la requête
+    """
+    frames = list(iter_frames(conn, query))
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+__all__ = ['open_connection', 'iter_frames', 'read_frame']
@@ -24,8 +24,28 @@ import os
 import re
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from .config import config
+from .log_utils import get_logger
+
+# En dessous de ce nombre de fichiers, le coût du pool n'est pas amorti
+PARALLEL_SCAN_THRESHOLD = 64
+
+# Lecture de fichiers : I/O bound, plus de threads que de CPU
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Lecture de l'en-tête des fichiers par blocs, bornée à 64 Ko ; la balise
+# <claude> doit apparaître dans les 16 premiers Ko
+HEADER_CHUNK_SIZE = 8192
+HEADER_PROBE_SIZE = 16384
+HEADER_MAX_SIZE = 65536
+
+# Bloc de documentation Claude, compilé une seule fois
+_CLAUDE_RE = re.compile(r'///\s*<claude>(.*?)///\s*</claude>', re.DOTALL)
+_CLAUDE_START = b'<claude>'
+_CLAUDE_END = b'</claude>'
 
 class DocAnalyzer:
     """Analyseur de documentation pour les fichiers Dart."""
@@ -35,39 +55,20 @@ class DocAnalyzer:
         self.lib_path = config.lib_dir
         self.output_dir = config.output_doc_dir
         self.docs = []
-        self._setup_logging()
+        # Filtres d'exclusion précalculés (str.startswith/endswith acceptent un tuple)
+        self._excluded_prefixes = tuple(
+            os.path.normpath(d) + os.sep for d in config.excluded_dirs
+        )
+        self._excluded_suffixes = tuple(config.excluded_files)
+        # Préfixe des chemins produits par le parcours (séparateur final
+        # ajouté s'il manque), retiré par découpage au lieu de os.path.relpath
+        self._lib_prefix = os.path.join(self.lib_path, '')
+        self._lib_prefix_len = len(self._lib_prefix)
+        self.logger = get_logger('DocAnalyzer')
 
-        # Assure que le répertoire de sortie existe
-        os.makedirs(self.output_dir, exist_ok=True)
         self.logger.info(f"Output directory: {self.output_dir}")
         self.logger.info(f"Library path: {self.lib_path}")
 
-    def _setup_logging(self) -> None:
-        """Configure le système de logging."""
-        self.logger = logging.getLogger('DocAnalyzer')
-
-        # Configuration du niveau de log depuis pml.yaml
-        self.logger.setLevel(getattr(logging, config.log_level.upper()))
-
-        # Configuration du formateur
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-
-        # Handler console
-        if config.log_to_console:
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
-
-        # Handler fichier
-        if config.log_file:
-            log_dir = os.path.dirname(config.log_file)
-            os.makedirs(log_dir, exist_ok=True)
-            file_handler = logging.FileHandler(config.log_file)
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-
     def extract_claude_doc(self, content: str) -> Optional[str]:
         """Extrait la documentation entre les balises <claude> et </claude>.
 
@@ -77,33 +78,129 @@ class DocAnalyzer:
         Returns:
             Documentation extraite ou None si non trouvée
         """
-        pattern = r'///\s*<claude>(.*?)///\s*</claude>'
-        match = re.search(pattern, content, re.DOTALL)
+        match = _CLAUDE_RE.search(content)
         if match:
             return match.group(1).strip()
         return None
 
-    def process_file(self, file_path: str) -> None:
-        """Traite un fichier et extrait sa documentation.
+    def _read_header(self, file_path: str) -> Optional[str]:
+        """Lit le début d'un fichier, jusqu'à la balise </claude>.
+
+        Le bloc de documentation se trouve en tête de fichier : sans balise
+        <claude> dans les HEADER_PROBE_SIZE premiers octets, le fichier est
+        ignoré sans décodage. Sinon la lecture s'arrête dès la balise
+        fermante trouvée, et au plus à HEADER_MAX_SIZE.
+
+        Args:
+            file_path: Chemin du fichier à lire
+
+        Returns:
+            Contenu lu, décodé en UTF-8, ou None si pas de balise <claude>
+        """
+        with open(file_path, 'rb') as f:
+            head = f.read(HEADER_PROBE_SIZE)
+            if _CLAUDE_START not in head:
+                return None
+            # Recherche limitée à la fin du bloc précédent + le nouveau bloc
+            start = 0
+            while _CLAUDE_END not in head[start:] and len(head) < HEADER_MAX_SIZE:
+                chunk = f.read(HEADER_CHUNK_SIZE)
+                if not chunk:
+                    break
+                start = max(0, len(head) - len(_CLAUDE_END) + 1)
+                head += chunk
+        return head.decode('utf-8', errors='replace')
+
+    def _extract_one(self, file_path: str) -> Optional[Tuple[str, str]]:
+        """Lit un fichier et en extrait la documentation.
+
+        Sans effet de bord sur self.docs : peut être appelée depuis
+        plusieurs threads.
 
         Args:
             file_path: Chemin du fichier à traiter
+
+        Returns:
+            Tuple (chemin relatif, documentation) ou None si non trouvée
         """
+        # Messages par fichier : formatés seulement si DEBUG est actif
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                doc = self.extract_claude_doc(content)
-                if doc:
-                    relative_path = os.path.relpath(file_path, self.lib_path)
-                    self.docs.append({
-                        'path': relative_path,
-                        'doc': doc
-                    })
-                    self.logger.debug(f"Documentation extraite de {relative_path}")
+            content = self._read_header(file_path)
+            doc = self.extract_claude_doc(content) if content is not None else None
+            if doc:
+                if file_path.startswith(self._lib_prefix):
+                    relative_path = file_path[self._lib_prefix_len:]
                 else:
-                    self.logger.debug(f"Pas de documentation trouvée dans {file_path}")
+                    relative_path = os.path.relpath(file_path, self.lib_path)
+                if debug:
+                    self.logger.debug("Documentation extraite de %s", relative_path)
+                return relative_path, doc
+            if debug:
+                self.logger.debug("Pas de documentation trouvée dans %s", file_path)
         except Exception as e:
             self.logger.error(f"Erreur lors du traitement de {file_path}: {str(e)}")
+        return None
+
+    def _add_doc(self, result: Optional[Tuple[str, str]]) -> None:
+        """Ajoute le résultat d'une extraction à self.docs."""
+        if result:
+            relative_path, doc = result
+            # Dossier et nom extraits une seule fois, pour le regroupement
+            self.docs.append({
+                'folder': os.path.dirname(relative_path),
+                'name': os.path.basename(relative_path),
+                'path': relative_path,
+                'doc': doc
+            })
+
+    def process_file(self, file_path: str) -> None:
+        """Traite un fichier et extrait sa documentation.
+
+        Args:
+            file_path: Chemin du fichier à traiter
+        """
+        self._add_doc(self._extract_one(file_path))
+
+    def _iter_dart_files(self, path: str) -> Iterator[str]:
+        """Parcourt récursivement un répertoire avec os.scandir.
+
+        Le type des entrées provient de getdents (DirEntry), sans stat()
+        supplémentaire par fichier ; les liens symboliques ne sont pas suivis.
+        Le parcours utilise une pile plutôt que la récursion : un seul
+        répertoire ouvert à la fois, et les filtres sont liés une seule fois
+        à des variables locales.
+
+        Args:
+            path: Répertoire à parcourir
+
+        Yields:
+            Chemin de chaque fichier .dart retenu
+        """
+        excluded_prefixes = self._excluded_prefixes
+        excluded_suffixes = self._excluded_suffixes
+        sep = os.sep
+        scandir = os.scandir
+        pending = [path]
+        push = pending.append
+
+        while pending:
+            directory = pending.pop()
+            try:
+                with scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Séparateur final : 'lib/generated' est exclu, mais
+                            # pas 'lib/generated_old'
+                            if not (entry.path + sep).startswith(excluded_prefixes):
+                                push(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            name = entry.name
+                            if name.endswith('.dart') and not name.endswith(excluded_suffixes):
+                                yield entry.path
+            except OSError as e:
+                # Comme os.walk, un répertoire illisible est ignoré
+                self.logger.warning(f"Cannot scan {directory}: {str(e)}")
 
     def scan_directory(self) -> None:
         """Parcourt le répertoire lib récursivement."""
@@ -112,18 +209,19 @@ class DocAnalyzer:
         self.logger.info(f"Excluded files: {config.excluded_files}")
 
         try:
-            for root, dirs, files in os.walk(self.lib_path):
-                # Filtrer les répertoires exclus
-                dirs[:] = [d for d in dirs if not any(
-                    os.path.join(root, d).startswith(exc_dir)
-                    for exc_dir in config.excluded_dirs
-                )]
-
-                for file in files:
-                    if (file.endswith('.dart') and
-                            not any(file.endswith(ext) for ext in config.excluded_files)):
-                        full_path = os.path.join(root, file)
-                        self.process_file(full_path)
+            paths = list(self._iter_dart_files(self.lib_path))
+
+            # Lectures parallélisées (I/O) ; self.docs n'est rempli qu'ici,
+            # dans le thread appelant, d'où l'absence de verrou
+            if len(paths) > PARALLEL_SCAN_THRESHOLD:
+                with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+                    results = list(executor.map(self._extract_one, paths))
+            else:
+                results = map(self._extract_one, paths)
+
+            add_doc = self._add_doc
+            for result in results:
+                add_doc(result)
 
             self.logger.info(f"Found documentation in {len(self.docs)} files")
 
@@ -137,7 +235,7 @@ class DocAnalyzer:
         Returns:
             Contenu du document généré
         """
-        summary = f"""# {config.app_name} Documentation Summary
+        header = f"""# {config.app_name} Documentation Summary
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 ## Project Overview
@@ -147,23 +245,21 @@ Documentation excludes:
 - Files: {', '.join(config.excluded_files)}
 
 ## Components Documentation\n\n"""
+        parts = [header]
 
         # Organiser par dossiers
         folders: Dict[str, List[Dict]] = {}
         for doc in self.docs:
-            folder = os.path.dirname(doc['path'])
-            if folder not in folders:
-                folders[folder] = []
-            folders[folder].append(doc)
+            folders.setdefault(doc['folder'], []).append(doc)
 
         # Générer la documentation par dossier
         for folder, docs in sorted(folders.items()):
-            summary += f"\n### {folder if folder else 'Root'}\n\n"
-            for doc in sorted(docs, key=lambda x: x['path']):
-                summary += f"#### {os.path.basename(doc['path'])}\n"
-                summary += doc['doc'] + "\n\n"
+            parts.append(f"\n### {folder if folder else 'Root'}\n\n")
+            for doc in sorted(docs, key=itemgetter('name')):
+                parts.append(f"#### {doc['name']}\n")
+                parts.append(doc['doc'] + "\n\n")
 
-        return summary
+        return "".join(parts)
 
     def save_summary(self) -> str:
         """Sauvegarde le résumé dans un fichier.
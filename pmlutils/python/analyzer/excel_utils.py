@@ -0,0 +1,151 @@
+# <claude>
+# File: excel_utils.py
+# Date: 2025-02-06
+#
+# USER INFO
+# - Shared Excel writing helpers for Python analyzers
+# - Streams rows with xlsxwriter in constant-memory mode
+# - Used by audit and Dart analyzers
+#
+# CONTEXT
+# - Reports can hold hundreds of thousands of rows
+# - Constant-memory mode flushes each row to disk once written,
+#   so rows must be written in order (pandas to_excel writes
+#   column by column and cannot be used)
+#
+# KEY FEATURES
+# - Row-by-row DataFrame streaming
+# - Header styling matching pandas exports
+# - Vectorized column width computation
+# </claude>
+
+from typing import Any, Iterable, List, Sequence
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+from xlsxwriter import Workbook
+from xlsxwriter.worksheet import Worksheet
+
+# Style d'en-tête identique à celui de pandas.DataFrame.to_excel
+HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+# Largeur maximale d'une colonne
+MAX_COLUMN_WIDTH = 50
+
+def open_workbook(filepath: str) -> Workbook:
+    """Ouvre un classeur xlsxwriter en mode mémoire constante.
+
+    Args:
+        filepath: Chemin du fichier Excel à créer
+
+    Returns:
+        Workbook: Classeur à fermer après écriture (utilisable avec `with`)
+    """
+    return Workbook(filepath, {'constant_memory': True})
+
+def column_widths(df: pd.DataFrame) -> List[int]:
+    """Calcule la longueur maximale du contenu de chaque colonne.
+
+    Args:
+        df: DataFrame source des données
+
+    Returns:
+        List[int]: Longueur maximale par colonne (valeurs manquantes ignorées)
+    """
+    widths = []
+    for col in df.columns:
+        series = df[col]
+        if is_integer_dtype(series.dtype):
+            # Entiers : la valeur la plus longue est l'un des extrêmes,
+            # inutile de convertir toute la colonne en texte
+            if series.empty:
+                widths.append(0)
+            else:
+                widths.append(max(len(str(series.min())), len(str(series.max()))))
+            continue
+        max_length = series.dropna().astype(str).str.len().max()
+        widths.append(0 if pd.isna(max_length) else int(max_length))
+    return widths
+
+def format_excel_sheet(worksheet: Worksheet, widths: List[int]) -> None:
+    """Formate une feuille Excel pour une meilleure lisibilité.
+
+    Args:
+        worksheet: Feuille Excel à formater
+        widths: Longueur maximale du contenu de chaque colonne, en-tête compris
+    """
+    for idx, max_length in enumerate(widths):
+        worksheet.set_column(idx, idx, min(max_length + 2, MAX_COLUMN_WIDTH))
+
+def write_frames(
+    workbook: Workbook, sheet_name: str, chunks: Iterable[pd.DataFrame]
+) -> Worksheet:
+    """Écrit des DataFrames successifs dans une nouvelle feuille, ligne par ligne.
+
+    Les largeurs de colonnes sont ajustées au contenu une fois tous les
+    blocs écrits.
+
+    Args:
+        workbook: Classeur de destination
+        sheet_name: Nom de la feuille à créer
+        chunks: DataFrames (ou blocs d'un même résultat) à écrire à la suite
+
+    Returns:
+        Worksheet: Feuille écrite
+    """
+    worksheet = workbook.add_worksheet(sheet_name)
+    widths: List[int] = []
+    row = 0
+    for df in chunks:
+        if row == 0:
+            headers = [str(col) for col in df.columns]
+            worksheet.write_row(0, 0, headers, workbook.add_format(HEADER_FORMAT))
+            widths = [len(header) for header in headers]
+            row = 1
+
+        widths = [max(pair) for pair in zip(widths, column_widths(df))]
+
+        # Les valeurs manquantes deviennent des cellules vides
+        values = df.astype(object).where(df.notna(), None)
+        for record in values.itertuples(index=False, name=None):
+            worksheet.write_row(row, 0, record)
+            row += 1
+
+    format_excel_sheet(worksheet, widths)
+    return worksheet
+
+def write_rows(
+    workbook: Workbook, sheet_name: str, headers: Sequence[str],
+    rows: Iterable[Sequence[Any]]
+) -> Worksheet:
+    """Écrit des lignes brutes (tuples) dans une nouvelle feuille, sans pandas.
+
+    Les largeurs de colonnes sont calculées pendant l'écriture, en une passe.
+
+    Args:
+        workbook: Classeur de destination
+        sheet_name: Nom de la feuille à créer
+        headers: Noms des colonnes
+        rows: Lignes à écrire (None donne une cellule vide)
+
+    Returns:
+        Worksheet: Feuille écrite
+    """
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, headers, workbook.add_format(HEADER_FORMAT))
+    widths = [len(str(header)) for header in headers]
+
+    row = 1
+    for record in rows:
+        worksheet.write_row(row, 0, record)
+        for idx, value in enumerate(record):
+            if value is not None:
+                length = len(str(value))
+                if length > widths[idx]:
+                    widths[idx] = length
+        row += 1
+
+    format_excel_sheet(worksheet, widths)
+    return worksheet
+
+__all__ = ['open_workbook', 'write_frames', 'write_rows', 'column_widths',
+           'format_excel_sheet']
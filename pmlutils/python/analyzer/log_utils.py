@@ -0,0 +1,95 @@
+# <claude>
+# File: log_utils.py
+# Date: 2025-02-06
+#
+# USER INFO
+# - Shared logger factory for Python analyzers
+# - Uses pml.yaml logging configuration
+#
+# CONTEXT
+# - Analyzers may be instantiated several times per process
+#   (standalone and from run_all_analyses)
+# - Handlers are attached once per logger name, so log
+#   records are never duplicated
+#
+# KEY FEATURES
+# - Level from pml.yaml
+# - Optional console and file handlers
+# - File output buffered (MemoryHandler), flushed on warnings
+# - Idempotent configuration
+# </claude>
+
+import os
+import logging
+import threading
+from logging.handlers import MemoryHandler
+from .config import config
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Enregistrements mis en tampon avant écriture dans le fichier de log ;
+# un WARNING (ou plus) vide le tampon immédiatement
+LOG_BUFFER_CAPACITY = 10000
+
+# Les analyseurs peuvent être créés dans des threads (run_all_analyses)
+_lock = threading.Lock()
+
+# Tampon unique vers le fichier de log, partagé par tous les loggers pour
+# conserver l'ordre chronologique des lignes
+_file_buffer = None
+
+def _get_file_buffer(formatter: logging.Formatter) -> MemoryHandler:
+    """Retourne le handler tamponné vers le fichier de log, créé au premier appel.
+
+    Args:
+        formatter: Formateur des lignes écrites
+
+    Returns:
+        MemoryHandler: Tampon dont la cible est le FileHandler du fichier de log
+    """
+    global _file_buffer
+    if _file_buffer is None:
+        os.makedirs(os.path.dirname(config.log_file), exist_ok=True)
+        file_handler = logging.FileHandler(config.log_file)
+        file_handler.setFormatter(formatter)
+        _file_buffer = MemoryHandler(
+            LOG_BUFFER_CAPACITY, flushLevel=logging.WARNING, target=file_handler
+        )
+    return _file_buffer
+
+def get_logger(name: str) -> logging.Logger:
+    """Retourne le logger demandé, configuré une seule fois depuis pml.yaml.
+
+    Args:
+        name: Nom du logger (généralement le nom de la classe)
+
+    Returns:
+        logging.Logger: Logger prêt à l'emploi
+    """
+    logger = logging.getLogger(name)
+    with _lock:
+        if not logger.handlers:
+            _configure(logger)
+    return logger
+
+def _configure(logger: logging.Logger) -> None:
+    """Attache les handlers définis dans pml.yaml à un logger.
+
+    Args:
+        logger: Logger à configurer
+    """
+    # Configuration du niveau de log depuis pml.yaml
+    logger.setLevel(getattr(logging, config.log_level.upper()))
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # Handler console
+    if config.log_to_console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+
+    # Handler fichier, tamponné (vidé à la sortie par logging.shutdown)
+    if config.log_file:
+        logger.addHandler(_get_file_buffer(formatter))
+
+__all__ = ['get_logger']
@@ -0,0 +1,168 @@
+# <claude>
+# File: result_cache.py
+# Date: 2025-02-06
+#
+# USER INFO
+# - Parquet cache of analyzer query results
+# - Stored in the temp output directory
+# - Requires pyarrow (disabled otherwise)
+#
+# CONTEXT
+# - Reports are often regenerated without a new Dart analysis
+#   (e.g. to tweak Excel formatting)
+# - Cached results are keyed by the database file state and the
+#   query text, so any new analysis or query change is a miss
+#
+# KEY FEATURES
+# - Whole-result and chunked (streamed) caching
+# - Atomic writes (partial results are never reused)
+# - Stale entries cleanup
+# </claude>
+
+import glob
+import hashlib
+import os
+from typing import Callable, Iterable, Iterator, Optional
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+class ResultCache:
+    """Cache Parquet des résultats de requêtes d'analyse."""
+
+    def __init__(self, cache_dir: str, db_path: str):
+        """Initialise le cache.
+
+        Args:
+            cache_dir: Répertoire des fichiers Parquet
+            db_path: Base de données dont l'état invalide le cache
+        """
+        self.cache_dir = cache_dir
+        self.db_path = db_path
+
+    def _cache_path(self, name: str, query: str) -> Optional[str]:
+        """Retourne le fichier de cache d'une requête, ou None si le cache est inactif.
+
+        Args:
+            name: Nom lisible du résultat (préfixe du fichier)
+            query: Requête SQL produisant le résultat
+
+        Returns:
+            Chemin du fichier Parquet correspondant à l'état actuel de la base
+        """
+        if pq is None:
+            return None
+        key = hashlib.md5(query.encode('utf-8'))
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # Un journal WAL vide (recréé à chaque ouverture) ne change pas les données
+            if stat.st_size:
+                key.update(f"{os.path.realpath(path)}:{stat.st_mtime_ns}:{stat.st_size}".encode('utf-8'))
+        return os.path.join(self.cache_dir, f"{name.replace(' ', '_')}-{key.hexdigest()[:16]}.parquet")
+
+    def _publish(self, tmp_path: str, path: str) -> None:
+        """Remplace les anciennes versions du résultat par le fichier écrit.
+
+        Args:
+            tmp_path: Fichier temporaire complet
+            path: Fichier de cache définitif
+        """
+        for stale in glob.glob(path.rsplit('-', 1)[0] + '-*.parquet'):
+            os.remove(stale)
+        os.replace(tmp_path, path)
+
+    def frame(self, name: str, query: str, load: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Retourne un résultat complet depuis le cache, ou le charge et le met en cache.
+
+        Args:
+            name: Nom lisible du résultat
+            query: Requête SQL produisant le résultat (clé du cache)
+            load: Fonction exécutant la requête en cas d'absence du cache
+
+        Returns:
+            pd.DataFrame: Résultat de la requête
+        """
+        path = self._cache_path(name, query)
+        if path is None:
+            return load()
+        if os.path.exists(path):
+            return pq.read_table(path).to_pandas()
+
+        df = load()
+        tmp_path = path + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression='zstd')
+            self._publish(tmp_path, path)
+        except (pa.ArrowException, OSError):
+            # Le cache est une optimisation : son échec n'est pas bloquant
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return df
+
+    def frames(
+        self,
+        name: str,
+        query: str,
+        load: Callable[[], Iterable[pd.DataFrame]],
+        chunksize: int
+    ) -> Iterator[pd.DataFrame]:
+        """Retourne un résultat par blocs depuis le cache, ou le lit et le met en cache au fil de l'eau.
+
+        Args:
+            name: Nom lisible du résultat
+            query: Requête SQL produisant le résultat (clé du cache)
+            load: Fonction retournant les blocs de la requête en cas d'absence du cache
+            chunksize: Nombre de lignes par bloc relu depuis le cache
+
+        Yields:
+            pd.DataFrame: Bloc de résultats
+        """
+        path = self._cache_path(name, query)
+        if path is None:
+            yield from load()
+            return
+        if os.path.exists(path):
+            parquet_file = pq.ParquetFile(path)
+            empty = True
+            for batch in parquet_file.iter_batches(batch_size=chunksize):
+                empty = False
+                yield batch.to_pandas()
+            if empty:
+                yield parquet_file.schema_arrow.empty_table().to_pandas()
+            return
+
+        tmp_path = path + '.tmp'
+        writer = None
+        caching = True
+        completed = False
+        try:
+            for chunk in load():
+                if caching:
+                    try:
+                        table = pa.Table.from_pandas(chunk, preserve_index=False)
+                        if writer is None:
+                            os.makedirs(self.cache_dir, exist_ok=True)
+                            writer = pq.ParquetWriter(tmp_path, table.schema, compression='zstd')
+                        writer.write_table(table.cast(writer.schema))
+                    except (pa.ArrowException, OSError):
+                        # Schéma instable entre blocs : le résultat n'est pas mis en cache
+                        caching = False
+                yield chunk
+            completed = True
+        finally:
+            if writer is not None:
+                writer.close()
+            if completed and caching and writer is not None:
+                self._publish(tmp_path, path)
+            elif os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+__all__ = ['ResultCache']
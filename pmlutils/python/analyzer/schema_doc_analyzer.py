@@ -20,55 +20,126 @@
 # </claude>
 
 import sqlite3
-import pandas as pd
 import os
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from .config import config
+from .log_utils import get_logger
+from .db_utils import open_connection
+from .excel_utils import open_workbook, write_rows
+
+# Descriptions des tables du schéma Dart
+_TABLE_DESCRIPTIONS = {
+    'source_files': 'Stores Dart source file information',
+    'file_imports': 'Records import statements used in files',
+    'file_import_relations': 'Maps files to their imports',
+    'classes': 'Defines classes, interfaces, and mixins',
+    'class_methods': 'Contains methods and their metrics',
+    'class_documentations': 'Auto-generated class documentation',
+    'class_usage_references': 'Track class usage and references',
+    'method_usage_references': 'Track method calls and usage'
+}
+
+# Relations entre tables et concepts de l'analyse AST (contenu statique)
+_RELATIONS = (
+    {
+        'source_table': 'file_imports',
+        'target_table': 'source_files',
+        'source_column': 'file_id',
+        'target_column': 'file_id',
+        'type': '1:N',
+        'description': 'File imports relationship'
+    },
+    {
+        'source_table': 'file_imports',
+        'target_table': 'file_imports',
+        'source_column': 'import_id',
+        'target_column': 'import_path',
+        'type': 'UNIQUE',
+        'description': 'Unique import identifier'
+    },
+    {
+        'source_table': 'classes',
+        'target_table': 'source_files',
+        'source_column': 'file_id',
+        'target_column': 'file_id',
+        'type': '1:N',
+        'description': 'Classes defined in file'
+    },
+    {
+        'source_table': 'class_methods',
+        'target_table': 'classes',
+        'source_column': 'class_id',
+        'target_column': 'class_id',
+        'type': '1:N',
+        'description': 'Methods belonging to class'
+    },
+    {
+        'source_table': 'class_usage_references',
+        'target_table': 'classes',
+        'source_column': 'referenced_class_id',
+        'target_column': 'class_id',
+        'type': 'N:1',
+        'description': 'Class usage tracking'
+    },
+    {
+        'source_table': 'method_usage_references',
+        'target_table': 'class_methods',
+        'source_column': 'referenced_method_id',
+        'target_column': 'method_id',
+        'type': 'N:1',
+        'description': 'Method usage tracking'
+    }
+)
+
+_AST_INFO = (
+    {
+        'concept': 'AST Analysis',
+        'description': 'Parses Dart source into Abstract Syntax Tree',
+        'usage': 'Classes and methods extraction'
+    },
+    {
+        'concept': 'AST Visitors',
+        'description': 'Tree traversal for information extraction',
+        'usage': 'Definition and usage analysis'
+    },
+    {
+        'concept': 'Code Metrics',
+        'description': 'Complexity and maintainability metrics',
+        'usage': 'Code quality assessment'
+    },
+    {
+        'concept': 'Usage Analysis',
+        'description': 'Tracks class and method usage',
+        'usage': 'Dead code detection'
+    }
+)
 
 class SchemaDocAnalyzer:
     """Analyseur de la structure de la base de données SQLite."""
 
-    def __init__(self):
-        """Initialise l'analyseur avec la configuration de pml.yaml."""
+    def __init__(self, conn: Optional[sqlite3.Connection] = None):
+        """Initialise l'analyseur avec la configuration de pml.yaml.
+
+        Args:
+            conn: Connexion existante à réutiliser (sinon une connexion est
+                ouverte au premier accès)
+        """
         self.db_path = config.db_path
         self.output_dir = config.output_doc_dir
-        self._setup_logging()
+        self._conn: Optional[sqlite3.Connection] = conn
+        self._owns_conn = conn is None
+        self.logger = get_logger('SchemaDocAnalyzer')
 
-        # Création du répertoire de sortie
-        os.makedirs(self.output_dir, exist_ok=True)
         self.logger.info(f"Output directory: {self.output_dir}")
         self.logger.info(f"Database path: {self.db_path}")
 
-    def _setup_logging(self) -> None:
-        """Configure le système de logging."""
-        self.logger = logging.getLogger('SchemaDocAnalyzer')
-
-        # Configuration du niveau de log depuis pml.yaml
-        self.logger.setLevel(getattr(logging, config.log_level.upper()))
-
-        # Configuration du formateur
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-
-        # Handler console
-        if config.log_to_console:
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
-
-        # Handler fichier
-        if config.log_file:
-            log_dir = os.path.dirname(config.log_file)
-            os.makedirs(log_dir, exist_ok=True)
-            file_handler = logging.FileHandler(config.log_file)
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-
     def _connect_db(self) -> sqlite3.Connection:
         """Établit une connexion à la base de données.
 
+        Une connexion ouverte par l'analyseur est passée en lecture seule
+        (query_only) : elle sert à toutes les requêtes de l'export.
+
         Returns:
             sqlite3.Connection: Connexion à la base
 
@@ -76,16 +147,24 @@ class SchemaDocAnalyzer:
             sqlite3.Error: Si la connexion échoue
         """
         try:
-            return sqlite3.connect(self.db_path)
+            if self._conn is None:
+                self._conn = open_connection(self.db_path)
+                self._conn.execute("PRAGMA query_only = ON")
+            return self._conn
         except sqlite3.Error as e:
             self.logger.error(f"Database connection error: {str(e)}")
             raise
 
-    def get_tables_info(self) -> pd.DataFrame:
+    def get_tables_info(
+        self, conn: Optional[sqlite3.Connection] = None
+    ) -> List[Dict[str, Any]]:
         """Récupère les informations sur toutes les tables.
 
+        Args:
+            conn: Connexion à utiliser (par défaut celle de l'analyseur)
+
         Returns:
-            pd.DataFrame: Informations sur les tables
+            List[Dict[str, Any]]: Informations sur les tables
         """
         self.logger.info("Getting tables information...")
         query = """
@@ -100,132 +179,53 @@ class SchemaDocAnalyzer:
         """
 
         try:
-            with self._connect_db() as conn:
-                df = pd.read_sql_query(query, conn)
-
-            descriptions = {
-                'source_files': 'Stores Dart source file information',
-                'file_imports': 'Records import statements used in files',
-                'file_import_relations': 'Maps files to their imports',
-                'classes': 'Defines classes, interfaces, and mixins',
-                'class_methods': 'Contains methods and their metrics',
-                'class_documentations': 'Auto-generated class documentation',
-                'class_usage_references': 'Track class usage and references',
-                'method_usage_references': 'Track method calls and usage'
-            }
-            df['description'] = df['table_name'].map(descriptions)
+            conn = conn or self._connect_db()
+            rows = conn.execute(query).fetchall()
 
-            self.logger.debug(f"Found {len(df)} tables")
-            return df
+            tables = [
+                {
+                    'table_name': table_name,
+                    'create_statement': create_statement,
+                    'description': _TABLE_DESCRIPTIONS.get(table_name)
+                }
+                for table_name, create_statement in rows
+            ]
+
+            self.logger.debug(f"Found {len(tables)} tables")
+            return tables
 
         except Exception as e:
             self.logger.error(f"Error getting tables info: {str(e)}")
             raise
 
-    def get_relations_info(self) -> pd.DataFrame:
+    def get_relations_info(self) -> Tuple[Dict[str, str], ...]:
         """Récupère les informations sur les relations entre tables.
 
         Returns:
-            pd.DataFrame: Informations sur les relations
+            Tuple[Dict[str, str], ...]: Informations sur les relations
         """
         self.logger.info("Getting relations information...")
-        try:
-            relations = [
-                {
-                    'source_table': 'file_imports',
-                    'target_table': 'source_files',
-                    'source_column': 'file_id',
-                    'target_column': 'file_id',
-                    'type': '1:N',
-                    'description': 'File imports relationship'
-                },
-                {
-                    'source_table': 'file_imports',
-                    'target_table': 'file_imports',
-                    'source_column': 'import_id',
-                    'target_column': 'import_path',
-                    'type': 'UNIQUE',
-                    'description': 'Unique import identifier'
-                },
-                {
-                    'source_table': 'classes',
-                    'target_table': 'source_files',
-                    'source_column': 'file_id',
-                    'target_column': 'file_id',
-                    'type': '1:N',
-                    'description': 'Classes defined in file'
-                },
-                {
-                    'source_table': 'class_methods',
-                    'target_table': 'classes',
-                    'source_column': 'class_id',
-                    'target_column': 'class_id',
-                    'type': '1:N',
-                    'description': 'Methods belonging to class'
-                },
-                {
-                    'source_table': 'class_usage_references',
-                    'target_table': 'classes',
-                    'source_column': 'referenced_class_id',
-                    'target_column': 'class_id',
-                    'type': 'N:1',
-                    'description': 'Class usage tracking'
-                },
-                {
-                    'source_table': 'method_usage_references',
-                    'target_table': 'class_methods',
-                    'source_column': 'referenced_method_id',
-                    'target_column': 'method_id',
-                    'type': 'N:1',
-                    'description': 'Method usage tracking'
-                }
-            ]
-            return pd.DataFrame(relations)
+        return _RELATIONS
 
-        except Exception as e:
-            self.logger.error(f"Error getting relations info: {str(e)}")
-            raise
-
-    def get_ast_insights(self) -> pd.DataFrame:
+    def get_ast_insights(self) -> Tuple[Dict[str, str], ...]:
         """Récupère les insights sur l'analyse AST.
 
         Returns:
-            pd.DataFrame: Informations sur l'analyse AST
+            Tuple[Dict[str, str], ...]: Informations sur l'analyse AST
         """
         self.logger.info("Getting AST insights...")
-        try:
-            ast_info = [
-                {
-                    'concept': 'AST Analysis',
-                    'description': 'Parses Dart source into Abstract Syntax Tree',
-                    'usage': 'Classes and methods extraction'
-                },
-                {
-                    'concept': 'AST Visitors',
-                    'description': 'Tree traversal for information extraction',
-                    'usage': 'Definition and usage analysis'
-                },
-                {
-                    'concept': 'Code Metrics',
-                    'description': 'Complexity and maintainability metrics',
-                    'usage': 'Code quality assessment'
-                },
-                {
-                    'concept': 'Usage Analysis',
-                    'description': 'Tracks class and method usage',
-                    'usage': 'Dead code detection'
-                }
-            ]
-            return pd.DataFrame(ast_info)
-        except Exception as e:
-            self.logger.error(f"Error getting AST insights: {str(e)}")
-            raise
+        return _AST_INFO
 
-    def get_file_contents(self) -> pd.DataFrame:
+    def get_file_contents(
+        self, conn: Optional[sqlite3.Connection] = None
+    ) -> List[Dict[str, Any]]:
         """Récupère un résumé du contenu des fichiers.
 
+        Args:
+            conn: Connexion à utiliser (par défaut celle de l'analyseur)
+
         Returns:
-            pd.DataFrame: Résumé du contenu des fichiers
+            List[Dict[str, Any]]: Résumé du contenu des fichiers
         """
         self.logger.info("Getting file contents...")
         query = """
@@ -241,10 +241,12 @@ class SchemaDocAnalyzer:
         ORDER BY sf.file_path, c.class_name
         """
         try:
-            with self._connect_db() as conn:
-                df = pd.read_sql_query(query, conn)
-            self.logger.debug(f"Found {len(df)} file entries")
-            return df
+            conn = conn or self._connect_db()
+            cursor = conn.execute(query)
+            columns = [column[0] for column in cursor.description]
+            contents = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            self.logger.debug(f"Found {len(contents)} file entries")
+            return contents
         except Exception as e:
             self.logger.error(f"Error getting file contents: {str(e)}")
             raise
@@ -253,29 +255,24 @@ class SchemaDocAnalyzer:
         """Exporte la documentation au format Excel."""
         self.logger.info("Starting documentation export...")
         try:
-            dfs = {
-                'Schema_Tables': self.get_tables_info(),
+            # Une seule connexion pour les deux requêtes
+            conn = self._connect_db()
+            sheets = {
+                'Schema_Tables': self.get_tables_info(conn),
                 'Schema_Relations': self.get_relations_info(),
                 'AST_Analysis': self.get_ast_insights(),
-                'Code_Structure': self.get_file_contents()
+                'Code_Structure': self.get_file_contents(conn)
             }
 
             filepath = os.path.join(self.output_dir, config.documentation_file)
             self.logger.info(f"Exporting to: {filepath}")
 
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                for sheet_name, df in dfs.items():
+            with open_workbook(filepath) as workbook:
+                for sheet_name, records in sheets.items():
                     self.logger.debug(f"Writing sheet: {sheet_name}")
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                    # Format des colonnes
-                    worksheet = writer.sheets[sheet_name]
-                    for idx, col in enumerate(df):
-                        max_length = max(
-                            df[col].astype(str).apply(len).max(),
-                            len(str(col))
-                        )
-                        worksheet.column_dimensions[chr(65 + idx)].width = min(max_length + 2, 50)
+                    headers = list(records[0]) if records else []
+                    write_rows(workbook, sheet_name, headers,
+                               (tuple(record.values()) for record in records))
 
             self.logger.info("Documentation export completed successfully")
 
@@ -292,6 +289,14 @@ class SchemaDocAnalyzer:
         except Exception as e:
             self.logger.error("Schema documentation generation failed")
             raise
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Ferme la connexion si elle a été ouverte par l'analyseur."""
+        if self._owns_conn and self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 def main() -> None:
     """Point d'entrée pour l'exécution en tant que module."""
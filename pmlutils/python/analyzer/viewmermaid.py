@@ -31,70 +31,64 @@
 import webbrowser
 import tempfile
 import os
-import logging
 from .config import config
+from .log_utils import get_logger
+
+# Page HTML de rendu ; __APP__ et __CODE__ sont remplacés au rendu
+# (pas d'accolades à échapper, contrairement à une f-string)
+_HTML_TEMPLATE = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <title>__APP__ - Mermaid Diagram</title>
+    <script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>
+    <script>
+        mermaid.initialize({
+            startOnLoad: true,
+            theme: 'base',
+            themeVariables: {
+                fontSize: '16px',
+                fontFamily: 'arial',
+                nodeBkg: 'transparent',
+                mainBkg: 'transparent',
+                edgeLabelBackground: 'transparent',
+                lineColor: 'black'
+            }
+        });
+    </script>
+    <style>
+        body {
+            margin: 20px;
+            font-family: Arial, sans-serif;
+        }
+        .mermaid {
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            min-height: 80vh;
+        }
+    </style>
+</head>
+<body>
+    <div class="mermaid">
+        __CODE__
+    </div>
+</body>
+</html>
+"""
 
 class MermaidRenderer:
     def __init__(self):
         self.output_dir = config.output_temp_dir
-        self._setup_logging()
+        self.logger = get_logger('MermaidRenderer')
 
-        os.makedirs(self.output_dir, exist_ok=True)
         self.logger.info(f"Output directory: {self.output_dir}")
 
-    def _setup_logging(self):
-        """Configure le logging."""
-        self.logger = logging.getLogger('MermaidRenderer')
-        self.logger.setLevel(logging.INFO)
-
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        ))
-        self.logger.addHandler(console_handler)
-
     def _create_html_template(self, mermaid_code: str) -> str:
         """Crée le template HTML avec le code Mermaid."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{config.app_name} - Mermaid Diagram</title>
-            <script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>
-            <script>
-                mermaid.initialize({{
-                    startOnLoad: true,
-                    theme: 'base',
-                    themeVariables: {{
-                        fontSize: '16px',
-                        fontFamily: 'arial',
-                        nodeBkg: 'transparent',
-                        mainBkg: 'transparent',
-                        edgeLabelBackground: 'transparent',
-                        lineColor: 'black'
-                    }}
-                }});
-            </script>
-            <style>
-                body {{
-                    margin: 20px;
-                    font-family: Arial, sans-serif;
-                }}
-                .mermaid {{
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                    min-height: 80vh;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="mermaid">
-                {mermaid_code}
-            </div>
-        </body>
-        </html>
-        """
+        return (_HTML_TEMPLATE
+                .replace('__APP__', config.app_name)
+                .replace('__CODE__', mermaid_code))
 
     def render(self, mermaid_code: str, title: str = None):
         """
@@ -110,11 +104,19 @@ class MermaidRenderer:
             html_content = self._create_html_template(mermaid_code)
 
             # Créer un fichier temporaire dans le répertoire de sortie configuré
+            # (écriture directe sur le descripteur, sans couche d'E/S bufferisée)
             suffix = f"_{title}.html" if title else ".html"
-            temp_file_path = os.path.join(self.output_dir, f"mermaid_{config.app_name}{suffix}")
-
-            with open(temp_file_path, 'w', encoding='utf-8') as temp_file:
-                temp_file.write(html_content)
+            fd, temp_file_path = tempfile.mkstemp(
+                prefix=f"mermaid_{config.app_name}_",
+                suffix=suffix,
+                dir=self.output_dir
+            )
+            try:
+                data = memoryview(html_content.encode('utf-8'))
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
 
             self.logger.info(f"Created temporary file: {temp_file_path}")
 